@@ -1,87 +1,237 @@
-# Computer Vision Analysis Function (UPDATED FOR BOTH MODEL TYPES)
-def analyze_satellite_image(s3_key, session, model, processor, device):
+# Computer Vision Analysis Function (UPDATED FOR BOTH MODEL TYPES + BATCHED INFERENCE)
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+def get_presigned_urls_batch(s3_keys, session):
+    """Generate presigned URLs for many S3 keys in a single SQL round-trip"""
+    # Bind the keys as parameters: no SQL injection via key names, and
+    # Snowflake can reuse the cached statement across calls
+    values_clause = ", ".join("(?)" for _ in s3_keys)
+    url_query = f"""
+    SELECT v.s3_key, GET_PRESIGNED_URL('@s3_imagery_stage_direct', v.s3_key, 3600) AS url
+    FROM (VALUES {values_clause}) AS v(s3_key)
+    """
+    url_result = session.sql(url_query, params=list(s3_keys)).collect()
+    return {row['S3_KEY']: row['URL'] for row in url_result}
+
+def download_image(image_url):
+    """Stream an image from HTTP straight into PIL and decode at bounded size"""
+    response = requests.get(image_url, stream=True, timeout=30)
+    response.raw.decode_content = True
+    image = Image.open(response.raw)
+    # libjpeg DCT-domain scaling decodes large JPEGs at 1/8-1/2 resolution for
+    # free - the processor only needs 224x224 anyway
+    image.draft("RGB", (224, 224))
+    return image.convert('RGB')
+
+# Sub-batch size for the download -> H2D copy -> compute pipeline
+PIPELINE_CHUNK = 16
+
+def resize_center_crop(image, size=224):
+    """PIL resize (short side to size) + center crop to size x size"""
+    w, h = image.size
+    scale = size / min(w, h)
+    image = image.resize((max(size, round(w * scale)), max(size, round(h * scale))), Image.BILINEAR)
+    w, h = image.size
+    left = (w - size) // 2
+    top = (h - size) // 2
+    return image.crop((left, top, left + size, top + size))
+
+def preprocess_batch(images, pin=False):
+    """Resize/crop on CPU and stack as uint8 - normalization happens on-device"""
+    arrays = [np.asarray(resize_center_crop(image), dtype=np.uint8) for image in images]
+    batch = torch.from_numpy(np.stack(arrays))  # (N, 224, 224, 3) uint8
+    # Pinned memory enables true async H2D copies on the copy stream; pinning
+    # needs CUDA, so CPU-only hosts keep the plain pageable tensor
+    return batch.pin_memory() if pin else batch
+
+def get_norm_constants(model, processor, device):
+    """Cache the processor's mean/std as (3,1,1) GPU tensors on the model"""
+    cached = getattr(model, '_norm_constants', None)
+    if cached is not None:
+        return cached
+    if hasattr(processor, 'image_mean'):
+        mean, std = processor.image_mean, processor.image_std
+    else:
+        # ImageNet defaults for the torchvision fallback
+        mean, std = [0.485, 0.456, 0.406], [0.229, 0.224, 0.225]
+    mean = torch.tensor(mean, device=device).view(3, 1, 1)
+    std = torch.tensor(std, device=device).view(3, 1, 1)
+    model._norm_constants = (mean, std)
+    return mean, std
+
+def get_cuda_graph(model, batch_size, device):
+    """Capture (or fetch) a CUDA graph of the forward pass for one batch size.
+
+    Replaying a captured graph collapses the ~20 kernel launches per
+    transformer block into a single cudaGraphLaunch. One graph is kept per
+    batch size; returns None (eager fallback) if capture fails.
+    """
+    graphs = getattr(model, '_cuda_graphs', None)
+    if graphs is None:
+        graphs = model._cuda_graphs = {}
+    if batch_size in graphs:
+        return graphs[batch_size]
+
+    try:
+        is_hf = hasattr(model, 'config')
+        amp = torch.autocast(device_type="cuda", dtype=torch.float16)
+        static_in = torch.zeros(batch_size, 3, 224, 224,
+                                device=device).to(memory_format=torch.channels_last)
+
+        # Warm up on a side stream before capture (required by CUDA graphs)
+        warmup_stream = torch.cuda.Stream()
+        warmup_stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(warmup_stream), amp:
+            for _ in range(3):
+                model(pixel_values=static_in) if is_hf else model(static_in)
+        torch.cuda.current_stream().wait_stream(warmup_stream)
+
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph), amp:
+            static_out = model(pixel_values=static_in) if is_hf else model(static_in)
+        static_logits = static_out.logits if is_hf else static_out
+        graphs[batch_size] = (graph, static_in, static_logits)
+    except Exception:
+        # Capture unsupported (e.g. data-dependent control flow) - stay eager
+        graphs[batch_size] = None
+    return graphs[batch_size]
+
+def analyze_satellite_images(s3_keys, session, model, processor, device):
     """
     GPU-accelerated computer vision analysis of satellite imagery
+    Pipelines download -> pinned H2D copy -> batched forward pass so the GPU
+    computes on chunk k while chunk k+1 is still downloading
     Supports both Hugging Face and torchvision models
     """
     try:
-        # Get presigned URL for secure S3 access
-        url_query = f"SELECT GET_PRESIGNED_URL('@s3_imagery_stage_direct', '{s3_key}', 3600) as url"
-        url_result = session.sql(url_query).collect()
-        
-        if not url_result:
-            return None, "Could not generate presigned URL"
-            
-        image_url = url_result[0]['URL']
-        
-        # Download and process image
-        response = requests.get(image_url, timeout=30)
-        image = Image.open(io.BytesIO(response.content)).convert('RGB')
-        
+        if not s3_keys:
+            return [], None
+
+        # Get presigned URLs for secure S3 access (one SQL round-trip for all keys)
+        url_map = get_presigned_urls_batch(s3_keys, session)
+        missing = [key for key in s3_keys if not url_map.get(key)]
+        if missing:
+            return None, f"Could not generate presigned URLs for: {missing}"
+
         # Check if we're using Hugging Face or torchvision model
         is_huggingface = hasattr(model, 'config')
-        
-        # Preprocess image based on model type
-        if is_huggingface:
-            # Hugging Face model
-            inputs = processor(image, return_tensors="pt").to(device)
-        else:
-            # Torchvision model
-            if isinstance(processor, transforms.Compose):
-                inputs = processor(image).unsqueeze(0).to(device)  # Add batch dimension
-            else:
-                # Fallback preprocessing
-                transform = transforms.Compose([
-                    transforms.Resize(224),
-                    transforms.CenterCrop(224),
-                    transforms.ToTensor(),
-                    transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
-                ])
-                inputs = transform(image).unsqueeze(0).to(device)
-        
-        # GPU-accelerated inference
+
+        # FP16 autocast on CUDA (~2x FP32 throughput via tensor cores)
+        amp_context = (torch.autocast(device_type="cuda", dtype=torch.float16)
+                       if device.type == "cuda" else nullcontext())
+        # Dedicated copy stream so H2D transfers overlap compute on the default stream
+        copy_stream = torch.cuda.Stream() if device.type == "cuda" else None
+        # Normalization constants live on the device, built once per model
+        norm_mean, norm_std = get_norm_constants(model, processor, device)
+
         start_time = time.time()
-        with torch.no_grad():
-            if is_huggingface:
-                outputs = model(**inputs)
-                logits = outputs.logits
-            else:
-                logits = model(inputs)
-            
-            predictions = torch.nn.functional.softmax(logits, dim=-1)
-        
+        images = []
+        logits_chunks = []
+        with ThreadPoolExecutor(max_workers=16) as executor, torch.inference_mode(), amp_context:
+            # Kick off every download up front; consume them chunk by chunk so
+            # later downloads overlap preprocessing and GPU compute of earlier chunks
+            futures = [executor.submit(download_image, url_map[key]) for key in s3_keys]
+
+            for chunk_start in range(0, len(futures), PIPELINE_CHUNK):
+                chunk_images = [f.result() for f in futures[chunk_start:chunk_start + PIPELINE_CHUNK]]
+                images.extend(chunk_images)
+
+                # Ship uint8 NHWC to the device (4x fewer H2D bytes than FP32)
+                host_batch = preprocess_batch(chunk_images, pin=copy_stream is not None)
+                if copy_stream is not None:
+                    with torch.cuda.stream(copy_stream):
+                        pixel_u8 = host_batch.to(device, non_blocking=True)
+                    # Compute (default stream) waits only on this chunk's copy
+                    torch.cuda.current_stream().wait_stream(copy_stream)
+                else:
+                    pixel_u8 = host_batch.to(device)
+
+                # Normalize on-device: NHWC uint8 -> channels-last FP32 in one pass
+                pixel_values = (pixel_u8.permute(0, 3, 1, 2)
+                                .contiguous(memory_format=torch.channels_last)
+                                .float().div_(255.).sub_(norm_mean).div_(norm_std))
+
+                # Replay a pre-captured CUDA graph for this batch size when available
+                graph_entry = (get_cuda_graph(model, pixel_values.shape[0], device)
+                               if device.type == "cuda" else None)
+                forward_logits = getattr(model, '_forward_logits', None)
+                if graph_entry is not None:
+                    graph, static_in, static_logits = graph_entry
+                    static_in.copy_(pixel_values)
+                    graph.replay()
+                    # Clone: the static output buffer is overwritten by the next replay
+                    logits_chunks.append(static_logits.clone())
+                elif forward_logits is not None:
+                    # Unified wrapper attached by the shared loader - no model-type branch.
+                    # Clone here too: torch.compile(mode="reduce-overhead") serves outputs
+                    # from CUDA-graph buffers that the next forward overwrites
+                    logits_chunks.append(forward_logits(pixel_values).clone())
+                elif is_huggingface:
+                    logits_chunks.append(model(pixel_values=pixel_values).logits.clone())
+                else:
+                    logits_chunks.append(model(pixel_values).clone())
+
+            logits = torch.cat(logits_chunks) if len(logits_chunks) > 1 else logits_chunks[0]
+
+            # Softmax is monotonic, so top-5 on raw logits matches top-5 on
+            # probabilities - skip the full 1000-way softmax and normalize only
+            # the 5 selected logits (in FP32) for the displayed confidence
+            top_logits, top_indices = torch.topk(logits.float(), 5, dim=-1)
+            top_confidences = torch.softmax(top_logits, dim=-1)
+
+        # Wait for the GPU so the timing reflects actual completion, not just launch
+        if device.type == "cuda":
+            torch.cuda.synchronize()
         inference_time = time.time() - start_time
-        
-        # Get top 5 predictions
-        top_predictions = torch.topk(predictions, 5)
-        
-        results = {
-            'image': image,
-            'predictions': [],
-            'inference_time': inference_time,
-            'device': str(device),
-            'model_type': 'Hugging Face' if is_huggingface else 'Torchvision'
-        }
-        
-        # Convert to readable format
-        for score, idx in zip(top_predictions.values[0], top_predictions.indices[0]):
-            if is_huggingface and hasattr(model, 'config') and hasattr(model.config, 'id2label'):
-                label = model.config.id2label[idx.item()]
-            else:
-                # ImageNet class names for torchvision models
-                label = f"Class_{idx.item()}"  # Simplified for demo
-            
-            confidence = score.item() * 100
-            results['predictions'].append({
-                'label': label,
-                'confidence': confidence
-            })
-        
-        return results, None
-        
+
+        # Two device->host transfers total instead of one .item() sync per prediction
+        confidences_cpu = top_confidences.cpu().tolist()
+        indices_cpu = top_indices.cpu().tolist()
+
+        # Flat id2label list attached at model load; resolve it lazily here for
+        # models loaded before that convention existed
+        id2label_list = getattr(model, '_id2label_list', None)
+        if id2label_list is None and is_huggingface and hasattr(model.config, 'id2label'):
+            id2label_list = [model.config.id2label[i] for i in range(len(model.config.id2label))]
+            model._id2label_list = id2label_list
+
+        all_results = []
+        for image, s3_key, conf_row, idx_row in zip(images, s3_keys, confidences_cpu, indices_cpu):
+            results = {
+                's3_key': s3_key,
+                'image': image,
+                'predictions': [],
+                'inference_time': inference_time,
+                'device': str(device),
+                'model_type': 'Hugging Face' if is_huggingface else 'Torchvision'
+            }
+
+            # Convert to readable format
+            for confidence, idx in zip(conf_row, idx_row):
+                # Flat list index instead of per-prediction hasattr + dict lookup
+                label = id2label_list[idx] if id2label_list else f"Class_{idx}"
+
+                results['predictions'].append({
+                    'label': label,
+                    'confidence': confidence * 100
+                })
+
+            all_results.append(results)
+
+        return all_results, None
+
     except Exception as e:
         return None, f"Analysis error: {str(e)}"
 
+def analyze_satellite_image(s3_key, session, model, processor, device):
+    """Single-image wrapper around the batched analysis path"""
+    all_results, error = analyze_satellite_images([s3_key], session, model, processor, device)
+    if error:
+        return None, error
+    return all_results[0], None
+
 print("🔬 Universal computer vision analysis function ready!")
+print("⚡ Batched inference: N images per forward pass")
 print("⚡ Supports both Hugging Face and torchvision models")
-print("🔒 Secure S3 access with presigned URLs") 
\ No newline at end of file
+print("🔒 Secure S3 access with presigned URLs")
@@ -1,28 +1,8 @@
 # Load pre-trained computer vision model (FIXED VERSION)
-print("🤖 Loading Computer Vision Model")
-print("=" * 40)
+# All loading logic lives in nga_cv_model_loader.py - one place for the stage
+# weight cache, FP16/channels-last, torch.compile, and warm-up optimizations.
+from nga_cv_model_loader import load_model
 
-start_time = time.time()
-
-# Use Google Vision Transformer (better PyTorch support than microsoft/resnet-50)
-model_name = "google/vit-base-patch16-224"
-print(f"📥 Downloading model: {model_name}")
-
-# Load processor and model with FIXED parameters
-processor = AutoImageProcessor.from_pretrained(model_name, use_fast=True)  # FIX: Added use_fast=True
-model = AutoModelForImageClassification.from_pretrained(model_name)        # FIX: Using native PyTorch model
-
-# Alternative: If you want to keep ResNet-50, use this instead:
-# model_name = "microsoft/resnet-50"  
-# processor = AutoImageProcessor.from_pretrained(model_name, use_fast=True)
-# model = AutoModelForImageClassification.from_pretrained(model_name, from_tf=True)  # FIX: Added from_tf=True
-
-# Move model to GPU if available  
-model = model.to(device)
-model.eval()
-
-load_time = time.time() - start_time
-print(f"✅ Model loaded in {load_time:.2f} seconds")
-print(f"📊 Model parameters: {sum(p.numel() for p in model.parameters()):,}")
-print(f"🔥 Running on: {device}")
-print("🎯 Ready for satellite image classification!") 
\ No newline at end of file
+# Prefer Google Vision Transformer (better PyTorch support than microsoft/resnet-50);
+# the loader falls through to the DeiT candidates and torchvision ResNet50 if needed
+model, processor, is_huggingface, id2label_list = load_model(device, session=session, prefer="vit-base")
@@ -0,0 +1,136 @@
+# Shared computer vision model loader
+# One place for every load-time optimization: Snowflake stage weight cache,
+# FP16 + channels-last, torch.compile, warm-up, and id2label pre-resolution.
+import time
+
+import torch
+from transformers import AutoImageProcessor, AutoModelForImageClassification
+from transformers.utils import is_accelerate_available
+
+# Candidates in preference order - DeiT-Tiny is ~12x fewer FLOPs than the base
+# models at small top-1 loss, plenty for ImageNet-label display in a dashboard
+MODEL_CANDIDATES = {
+    "deit-tiny": "facebook/deit-tiny-patch16-224",
+    "deit-base": "facebook/deit-base-patch16-224",
+    "vit-base": "google/vit-base-patch16-224",
+}
+
+MODEL_STAGE = "@model_stage"
+
+def _load_from_stage_or_hub(model_name, session, load_kwargs):
+    """Load an HF model/processor, preferring the Snowflake stage weight cache"""
+    local_model_dir = f"/tmp/{model_name.replace('/', '_')}"
+    stage_model_dir = f"{MODEL_STAGE}/{model_name.replace('/', '_')}"
+
+    if session is not None:
+        try:
+            session.file.get(f"{stage_model_dir}/", f"{local_model_dir}/")
+            processor = AutoImageProcessor.from_pretrained(local_model_dir, use_fast=True, local_files_only=True)
+            model = AutoModelForImageClassification.from_pretrained(local_model_dir, local_files_only=True, **load_kwargs)
+            print(f"📦 Loaded model from stage cache: {stage_model_dir}")
+            return model, processor
+        except Exception:
+            pass
+
+    print(f"📥 Downloading model: {model_name}")
+    processor = AutoImageProcessor.from_pretrained(model_name, use_fast=True)
+    model = AutoModelForImageClassification.from_pretrained(model_name, **load_kwargs)
+
+    if session is not None:
+        # Persist to the stage for the next cold start
+        try:
+            model.save_pretrained(local_model_dir)
+            processor.save_pretrained(local_model_dir)
+            session.file.put(f"{local_model_dir}/*", f"{stage_model_dir}/", auto_compress=False, overwrite=True)
+            print(f"💾 Cached model weights to {stage_model_dir}")
+        except Exception as stage_error:
+            print(f"⚠️  Could not cache model to stage: {stage_error}")
+
+    return model, processor
+
+def load_model(device, session=None, prefer="deit-tiny"):
+    """
+    Load the best available classification model for satellite image analysis.
+
+    Tries the preferred HF model first, then the remaining candidates, then a
+    torchvision ResNet50 as the last resort. Returns
+    (model, processor, is_huggingface, id2label_list).
+    """
+    print("🤖 Loading Computer Vision Model")
+    print("=" * 40)
+
+    start_time = time.time()
+
+    load_kwargs = {}
+    if is_accelerate_available():
+        # from_pretrained raises ImportError on this flag without accelerate,
+        # which the candidate loop would swallow all the way down to ResNet50
+        load_kwargs["low_cpu_mem_usage"] = True
+    if device.type == "cuda":
+        load_kwargs["torch_dtype"] = torch.float16  # load directly in FP16, halves copy bytes
+
+    model = processor = None
+    is_huggingface = True
+    candidate_order = [prefer] + [name for name in MODEL_CANDIDATES if name != prefer]
+    for candidate in candidate_order:
+        try:
+            model, processor = _load_from_stage_or_hub(MODEL_CANDIDATES[candidate], session, load_kwargs)
+            break
+        except Exception as e:
+            print(f"❌ Error loading {MODEL_CANDIDATES[candidate]}: {e}")
+
+    if model is None:
+        # Last resort: torchvision ResNet50 (guaranteed PyTorch weights)
+        print("🔄 Falling back to torchvision ResNet50...")
+        import torchvision.models as models
+        from torchvision import transforms
+
+        is_huggingface = False
+        model = models.resnet50(pretrained=True)
+        processor = transforms.Compose([
+            transforms.Resize(224),
+            transforms.CenterCrop(224),
+            transforms.ToTensor(),
+            transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+        ])
+
+    # Move model to GPU if available
+    model = model.to(device)
+    model.eval()
+
+    # Pre-resolve id2label into a flat list for O(1) indexing in the prediction loop
+    if is_huggingface:
+        id2label_list = [model.config.id2label[i] for i in range(len(model.config.id2label))]
+    else:
+        id2label_list = None
+    model._id2label_list = id2label_list
+
+    # FP16 + channels-last on GPU: tensor-core matmuls, NHWC kernels for the patch-embedding conv
+    if device.type == "cuda":
+        model = model.to(memory_format=torch.channels_last).half()
+
+    # Compile for kernel fusion + reduced Python overhead (~1.2-1.3x on ViT-class models)
+    if hasattr(torch, "compile") and device.type == "cuda":
+        import os
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", "/tmp/torchinductor_cache")
+        torch._inductor.config.fx_graph_cache = True  # persist compiled kernels across sessions
+        model = torch.compile(model, mode="reduce-overhead", fullgraph=False)
+        # Warm up so the one-time compile cost lands at startup, not on the first request
+        dummy = torch.zeros(1, 3, 224, 224, device=device, dtype=torch.float16).to(memory_format=torch.channels_last)
+        with torch.inference_mode():
+            model(pixel_values=dummy) if is_huggingface else model(dummy)
+        print("⚡ torch.compile enabled (reduce-overhead mode, warmed up)")
+
+    # Unified logits entry point so the inference hot path needn't branch on model type
+    if is_huggingface:
+        model._forward_logits = lambda pixel_values, _m=model: _m(pixel_values=pixel_values).logits
+    else:
+        model._forward_logits = model
+
+    load_time = time.time() - start_time
+    print(f"✅ Model loaded in {load_time:.2f} seconds")
+    print(f"📊 Model parameters: {sum(p.numel() for p in model.parameters()):,}")
+    print(f"🔥 Running on: {device}")
+    print("🎯 Ready for satellite image classification!")
+
+    return model, processor, is_huggingface, id2label_list
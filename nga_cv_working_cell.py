@@ -1,27 +1,14 @@
 # Load pre-trained computer vision model (WORKING VERSION)
-print("🤖 Loading Computer Vision Model")
-print("=" * 40)
+# All loading logic lives in nga_cv_model_loader.py - one place for the stage
+# weight cache, FP16/channels-last, torch.compile, and warm-up optimizations.
+from nga_cv_model_loader import load_model
 
-start_time = time.time()
-
-# Use Facebook DeiT (Data-efficient Image Transformer) - has native PyTorch weights
-model_name = "facebook/deit-base-patch16-224"
-print(f"📥 Downloading model: {model_name}")
-
-# Load processor and model with FIXED parameters
-processor = AutoImageProcessor.from_pretrained(model_name, use_fast=True)
-model = AutoModelForImageClassification.from_pretrained(model_name)  # Native PyTorch weights
-
-# Move model to GPU if available  
-model = model.to(device)
-model.eval()
-
-load_time = time.time() - start_time
-print(f"✅ Model loaded in {load_time:.2f} seconds")
-print(f"📊 Model parameters: {sum(p.numel() for p in model.parameters()):,}")
-print(f"🔥 Running on: {device}")
-print("🎯 Ready for satellite image classification!")
+# DeiT-Tiny first: ~12x fewer FLOPs than DeiT-Base at small top-1 loss. Stick
+# with FP16 for speed - INT8 ViT is frequently *slower* than FP16 on GPUs
+# without native INT8 attention kernels.
+model, processor, is_huggingface, id2label_list = load_model(device, session=session, prefer="deit-tiny")
 
 # Model info
 print(f"🏷️  Model type: {model.__class__.__name__}")
-print(f"📋 Labels available: {len(model.config.id2label)} categories") 
\ No newline at end of file
+if is_huggingface:
+    print(f"📋 Labels available: {len(id2label_list)} categories")
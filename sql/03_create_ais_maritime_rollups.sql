@@ -0,0 +1,69 @@
+-- =====================================================================================
+-- MAMMOTH Maritime Intelligence AIS Rollup Dynamic Tables
+-- Precomputed H3 / vessel-type aggregates for the Streamlit Maritime page
+-- =====================================================================================
+
+-- Set context
+USE DATABASE MAMMOTH;
+USE SCHEMA PUBLIC;
+USE WAREHOUSE DEMO_WH;
+
+-- =====================================================================================
+-- SAN FRANCISCO BAY AOI BASE VIEW
+-- =====================================================================================
+-- One definition of the AOI bbox and the columns the Streamlit page needs.
+-- Everything downstream (rollups here, ad-hoc analysis) reads this view, so
+-- the bounds live in exactly one place and the column scan stays narrow.
+
+CREATE OR REPLACE VIEW ais_sf_bay AS
+SELECT
+    mmsi,
+    vesselname,
+    vesseltype,
+    basedatetime,
+    lon,
+    lat
+FROM GEO_DATA.PUBLIC.AIS
+WHERE LAT BETWEEN 37.7034 AND 37.8324  -- San Francisco Bay Area
+  AND LON BETWEEN -123.7003 AND -122.1385;  -- AOI Longitude Bounds
+
+-- =====================================================================================
+-- AIS H3 SHIP DENSITY ROLLUP (San Francisco Bay AOI)
+-- =====================================================================================
+-- The Streamlit ship-density map previously scanned the full AIS table and
+-- grouped by H3 cell on every page view. AIS ingest is append-only and the
+-- AOI is fixed, so a dynamic table keyed on (h3_cell, day) turns the page
+-- query into a scan of a few hundred rollup rows instead of the raw feed.
+
+CREATE OR REPLACE DYNAMIC TABLE ais_h3res9_sf_daily
+TARGET_LAG = '5 minutes'
+WAREHOUSE = DEMO_WH
+AS
+SELECT
+    H3_POINT_TO_CELL(ST_MAKEPOINT(lon, lat), 9) AS h3_cell,
+    DATE_TRUNC('day', basedatetime) AS ping_day,
+    COUNT(*) AS ship_count,
+    APPROX_COUNT_DISTINCT(mmsi) AS vessel_count
+FROM ais_sf_bay
+GROUP BY 1, 2;
+
+-- =====================================================================================
+-- AIS VESSEL TYPE ROLLUP (San Francisco Bay AOI)
+-- =====================================================================================
+-- Same pattern for the vessel-type distribution chart: the page now pulls a
+-- per-day rollup joined to the static VESSEL_TYPES dimension.
+
+CREATE OR REPLACE DYNAMIC TABLE ais_vessel_type_sf_daily
+TARGET_LAG = '5 minutes'
+WAREHOUSE = DEMO_WH
+AS
+SELECT
+    vesseltype,
+    DATE_TRUNC('day', basedatetime) AS ping_day,
+    COUNT(*) AS vessel_count
+FROM ais_sf_bay
+GROUP BY 1, 2;
+
+-- Verify the rollups refresh
+SELECT * FROM ais_h3res9_sf_daily ORDER BY ship_count DESC LIMIT 10;
+SELECT * FROM ais_vessel_type_sf_daily ORDER BY vessel_count DESC LIMIT 10;
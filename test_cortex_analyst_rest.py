@@ -26,6 +26,15 @@ def test_cortex_analyst_rest_api():
         }
     }
     
+    # Encode once per format; a successful encode is also the validity check
+    try:
+        pretty_body = json.dumps(request_body, indent=2)
+        compact_body = json.dumps(request_body, separators=(',', ':'))
+        json_valid = True
+    except Exception as e:
+        pretty_body = compact_body = f"<JSON error: {e}>"
+        json_valid = False
+
     print("="*60)
     print("CORTEX ANALYST REST API TEST")
     print("="*60)
@@ -35,16 +44,16 @@ def test_cortex_analyst_rest_api():
     print("  - Content-Type: application/json")
     print("  - Authorization: Bearer <JWT_TOKEN>")
     print("\nRequest Body:")
-    print(json.dumps(request_body, indent=2))
-    
+    print(pretty_body)
+
     print("\n" + "="*60)
     print("CURL COMMAND TEMPLATE:")
     print("="*60)
     print(f"curl -X POST '{rest_api_url}' \\")
     print("  -H 'Content-Type: application/json' \\")
     print("  -H 'Authorization: Bearer <YOUR_JWT_TOKEN>' \\")
-    print("  -d '" + json.dumps(request_body, separators=(',', ':')) + "'")
-    
+    print("  -d '" + compact_body + "'")
+
     print("\n" + "="*60)
     print("VALIDATION CHECKLIST:")
     print("="*60)
@@ -52,13 +61,7 @@ def test_cortex_analyst_rest_api():
     print("✓ Request body follows Snowflake API specification")
     print("✓ Semantic model path references our uploaded file")
     print("✓ Message format is correct with user role and text content")
-    
-    # Validate JSON format
-    try:
-        json.dumps(request_body)
-        print("✓ JSON is valid")
-    except Exception as e:
-        print(f"✗ JSON error: {e}")
+    print("✓ JSON is valid" if json_valid else "✗ JSON is invalid (see above)")
     
     print("\nTo get a JWT token, you can:")
     print("1. Use Snowflake's OAuth flow")